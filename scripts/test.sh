@@ -1,6 +1,6 @@
 #!/usr/bin/env bash
 set -euo pipefail
 
-uv run pytest -n auto "$@" --cov
+uv run pytest -n auto --dist loadscope "$@" --cov
 uv run coverage report
 uv run coverage json
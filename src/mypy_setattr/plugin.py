@@ -1,33 +1,38 @@
 """Mypy plugin entry point for literal ``object.__setattr__`` assignments (plus matching ``setattr`` hooks)."""
 
-from collections.abc import Callable
-from dataclasses import InitVar, dataclass, field
+import sys
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
 from typing import Final, override
 
-from mypy.nodes import Expression, StrExpr, SymbolTableNode, TypeInfo, Var
+from mypy.nodes import Expression, MypyFile, StrExpr, SymbolTable, SymbolTableNode, TypeInfo, Var
 from mypy.plugin import FunctionContext, MethodContext, Plugin
 from mypy.subtypes import is_subtype
-from mypy.types import Instance, Type, get_proper_type
+from mypy.types import Instance, ProperType, Type, get_proper_type
 
 
 class SetattrPlugin(Plugin):
     """Register hooks that validate literal ``object.__setattr__`` usage (and mirror them for ``setattr``)."""
 
+    # mypy asks for a hook for every callable it sees, so answer with a single dict lookup.
+    # ``Plugin`` itself returns ``None`` for every name, hence no fallback to ``super()``.
     @override
     def get_function_hook(self, fullname: str) -> Callable[[FunctionContext], Type] | None:
-        match fullname:
-            case "builtins.setattr":
-                return setattr_hook
-            case _:
-                return super().get_function_hook(fullname)
+        return _FUNCTION_HOOKS.get(fullname)
 
     @override
     def get_method_hook(self, fullname: str) -> Callable[[MethodContext], Type] | None:
-        match fullname:
-            case "builtins.object.__setattr__":
-                return setattr_hook
-            case _:
-                return super().get_method_hook(fullname)
+        return _METHOD_HOOKS.get(fullname)
+
+    @override
+    def get_additional_deps(self, file: MypyFile) -> list[tuple[int, str, int]]:
+        # Called whenever mypy (re)loads a module, i.e. before any type checking of the new contents.
+        # ``TypeInfo`` objects are mutated in place on daemon updates, so lookups cached so far may be stale.
+        _lookup_by_name.cache_clear()
+        _names_chain.cache_clear()
+        return super().get_additional_deps(file)
 
 
 def setattr_hook(ctx: FunctionContext | MethodContext) -> Type:
@@ -40,6 +45,11 @@ def setattr_hook(ctx: FunctionContext | MethodContext) -> Type:
         Type: The default return type supplied by mypy for the call site.
 
     """
+    args: Final = ctx.args
+    # Most calls use a dynamic attribute name, which this plugin ignores; bail out before any allocation.
+    if len(args) <= 1 or not args[1] or not isinstance(args[1][0], StrExpr):
+        return ctx.default_return_type
+
     try:
         function_context: Final = SetattrFunctionContext(ctx)
     except ValueError as e:  # Wrong usage of setattr
@@ -47,21 +57,23 @@ def setattr_hook(ctx: FunctionContext | MethodContext) -> Type:
         return ctx.default_return_type
 
     literal_name_attr: Final = function_context.ensure_literal_name_attribute()
-    if literal_name_attr is None:  # When setattr is called with non-literal name, this plugin do nothing
+    if literal_name_attr is None:  # When the receiver type is not an instance, this plugin do nothing
         return ctx.default_return_type
 
     result: Final = literal_name_attr.check_type()
     if isinstance(result, LiteralNameAttributeTypeCheckResultPassed):
         return ctx.default_return_type
 
-    error_message: Final = LiteralNameAttributeTypeCheckResultErrorHandler(
-        error=result,
-    ).message()
+    error_message: Final = LiteralNameAttributeTypeCheckResultErrorHandler(error=result).message()
     ctx.api.fail(error_message, ctx.context)
 
     return ctx.default_return_type
 
 
+_FUNCTION_HOOKS: Final = {"builtins.setattr": setattr_hook}
+_METHOD_HOOKS: Final = {"builtins.object.__setattr__": setattr_hook}
+
+
 @dataclass(frozen=True)
 class TypeInfoWrapper:
     """Expose attribute lookups across the entire MRO for a ``TypeInfo``."""
@@ -78,56 +90,118 @@ class TypeInfoWrapper:
             SymbolTableNode | None: The matching symbol, if one exists.
 
         """
-        root_node: Final = self.info.names.get(name)
-        if root_node is not None:
-            return root_node
+        return _lookup_by_name(self.info, name)
 
-        for parent in self.info.mro:
-            parent_node = parent.names.get(name)
-            if parent_node is not None:
-                return parent_node
 
-        return None
+@lru_cache(maxsize=8192)
+def _lookup_by_name(info: TypeInfo, name: str) -> SymbolTableNode | None:
+    """Resolve ``name`` across the MRO of ``info``, memoised per ``(info, name)`` pair.
+
+    ``TypeInfo`` hashes by identity, so the cache never confuses two distinct classes.
+
+    Args:
+        info: Type whose hierarchy is searched.
+        name: Attribute name to resolve.
+
+    Returns:
+        SymbolTableNode | None: The matching symbol, if one exists.
+
+    """
+    for names in _names_chain(info):
+        node = names.get(name)
+        if node is not None:
+            return node
+
+    return None
+
+
+@lru_cache(maxsize=1024)
+def _names_chain(info: TypeInfo) -> tuple[SymbolTable, ...]:
+    """Flatten the symbol tables of ``info`` and its MRO into a tuple, in lookup order.
+
+    Args:
+        info: Type whose hierarchy is flattened.
+
+    Returns:
+        tuple[SymbolTable, ...]: ``info.names`` followed by the tables of its ancestors.
+
+    """
+    # ``mro[0]`` is ``info`` itself; skipping it also keeps ``info.names`` when the MRO is not computed yet.
+    return (info.names, *(parent.names for parent in islice(info.mro, 1, None)))
 
 
-@dataclass(frozen=True)
 class LiteralNameAttributeTypeCheckResultPassed:
-    """Marker indicating the attribute assignment is valid."""
+    """Marker indicating the attribute assignment is valid.
 
+    It carries no state, so ``check_type`` always returns the shared ``_PASSED`` instance.
+    """
 
-@dataclass(frozen=True)
-class LiteralNameAttributeTypeCheckResultAttributeDoesNotExist:
-    """Report that the attribute name is not defined on the type."""
+    __slots__ = ()
+
+
+_PASSED: Final = LiteralNameAttributeTypeCheckResultPassed()
+
+
+class _LiteralNameAttributeTypeCheckResultFailure:
+    """Common state of the failure results: the attribute name and its receiver type."""
+
+    __slots__ = ("name", "obj_type")
 
     name: str
     obj_type: Instance
 
+    def __init__(self, name: str, obj_type: Instance) -> None:
+        """Store the failing attribute name and its receiver type.
 
-@dataclass(frozen=True)
-class LiteralNameAttributeTypeCheckResultSymbolIsNotVariable:
+        Args:
+            name: Attribute name passed to ``setattr``.
+            obj_type: Type of the receiver object.
+
+        """
+        self.name = name
+        self.obj_type = obj_type
+
+
+class LiteralNameAttributeTypeCheckResultAttributeDoesNotExist(_LiteralNameAttributeTypeCheckResultFailure):
+    """Report that the attribute name is not defined on the type."""
+
+    __slots__ = ()
+
+
+class LiteralNameAttributeTypeCheckResultSymbolIsNotVariable(_LiteralNameAttributeTypeCheckResultFailure):
     """Report that the resolved symbol is not a data attribute."""
 
-    name: str
-    obj_type: Instance
+    __slots__ = ()
 
 
-@dataclass(frozen=True)
-class LiteralNameAttributeTypeCheckResultSymbolNodeTypeIsNone:
+class LiteralNameAttributeTypeCheckResultSymbolNodeTypeIsNone(_LiteralNameAttributeTypeCheckResultFailure):
     """Report that the attribute lacks type information."""
 
-    name: str
-    obj_type: Instance
+    __slots__ = ()
 
 
-@dataclass(frozen=True)
-class LiteralNameAttributeTypeCheckResultDoesNotSatisfyType:
+class LiteralNameAttributeTypeCheckResultDoesNotSatisfyType(_LiteralNameAttributeTypeCheckResultFailure):
     """Report a type mismatch between the assigned value and annotation."""
 
-    name: str
-    obj_type: Instance
+    __slots__ = ("actual", "expected")
+
     expected: Type
     actual: Type
 
+    def __init__(self, name: str, obj_type: Instance, *, expected: Type, actual: Type) -> None:
+        """Store the failing attribute together with the conflicting types.
+
+        Args:
+            name: Attribute name passed to ``setattr``.
+            obj_type: Type of the receiver object.
+            expected: Declared type of the attribute.
+            actual: Type of the assigned value.
+
+        """
+        super().__init__(name, obj_type)
+        self.expected = expected
+        self.actual = actual
+
 
 type LiteralNameAttributeTypeCheckResultFailed = (
     LiteralNameAttributeTypeCheckResultAttributeDoesNotExist
@@ -141,6 +215,24 @@ type LiteralNameAttributeTypeCheckResult = (
 )
 
 
+# Keyed by the concrete failure class; ``str.format`` renders the mypy types through ``str()``.
+_ERROR_MESSAGE_TEMPLATES: Final[Mapping[type[LiteralNameAttributeTypeCheckResultFailed], str]] = {
+    LiteralNameAttributeTypeCheckResultAttributeDoesNotExist: (
+        'attribute "{error.name}" does not exist on {obj_display}'
+    ),
+    LiteralNameAttributeTypeCheckResultSymbolIsNotVariable: (
+        'attribute "{error.name}" on {obj_display} is not a data attribute'
+    ),
+    LiteralNameAttributeTypeCheckResultSymbolNodeTypeIsNone: (
+        'attribute "{error.name}" on {obj_display} has no inferred type'
+    ),
+    LiteralNameAttributeTypeCheckResultDoesNotSatisfyType: (
+        'value of type "{error.actual}" is not assignable to attribute "{error.name}" '
+        'on {obj_display}; expected "{error.expected}"'
+    ),
+}
+
+
 @dataclass(frozen=True)
 class TypeDisplayFormatter:
     """Format mypy types and instances for error messages."""
@@ -171,30 +263,31 @@ class LiteralNameAttributeTypeCheckResultErrorHandler:
 
         """
         formatter: Final = TypeDisplayFormatter(self.error.obj_type)
-        obj_display: Final = formatter.display_string()
-        match self.error:
-            case LiteralNameAttributeTypeCheckResultAttributeDoesNotExist():
-                return f'attribute "{self.error.name}" does not exist on {obj_display}'
-            case LiteralNameAttributeTypeCheckResultSymbolIsNotVariable():
-                return f'attribute "{self.error.name}" on {obj_display} is not a data attribute'
-            case LiteralNameAttributeTypeCheckResultSymbolNodeTypeIsNone():
-                return f'attribute "{self.error.name}" on {obj_display} has no inferred type'
-            case LiteralNameAttributeTypeCheckResultDoesNotSatisfyType():
-                actual = str(self.error.actual)
-                expected = str(self.error.expected)
-                return (
-                    f'value of type "{actual}" is not assignable to attribute "{self.error.name}" '
-                    f'on {obj_display}; expected "{expected}"'
-                )
+        template: Final = _ERROR_MESSAGE_TEMPLATES[type(self.error)]
+        return template.format(error=self.error, obj_display=formatter.display_string())
 
 
-@dataclass(frozen=True)
 class SetattrFunctionContextLiteralNameAttribute:
     """Bundle details about a literal-string attribute assignment driven by ``object.__setattr__``."""
 
+    __slots__ = ("name", "obj_type", "value_type")
+
     name: str
     obj_type: Instance
-    value_type: Type
+    value_type: ProperType
+
+    def __init__(self, name: str, obj_type: Instance, value_type: ProperType) -> None:
+        """Store the literal assignment.
+
+        Args:
+            name: Literal attribute name passed to ``setattr``.
+            obj_type: Type of the receiver object.
+            value_type: Proper type of the assigned value.
+
+        """
+        self.name = name
+        self.obj_type = obj_type
+        self.value_type = value_type
 
     def check_type(self) -> LiteralNameAttributeTypeCheckResult:
         """Validate that the named attribute exists and accepts the provided value type.
@@ -213,16 +306,15 @@ class SetattrFunctionContextLiteralNameAttribute:
             return LiteralNameAttributeTypeCheckResultSymbolNodeTypeIsNone(self.name, self.obj_type)
 
         attribute_proper_type: Final = get_proper_type(symbol.node.type)
-        value_proper_type: Final = get_proper_type(self.value_type)
-        if not is_subtype(value_proper_type, attribute_proper_type):
+        if not is_subtype(self.value_type, attribute_proper_type):
             return LiteralNameAttributeTypeCheckResultDoesNotSatisfyType(
                 self.name,
                 self.obj_type,
                 expected=attribute_proper_type,
-                actual=value_proper_type,
+                actual=self.value_type,
             )
 
-        return LiteralNameAttributeTypeCheckResultPassed()
+        return _PASSED
 
 
 class WrongNumberOfArgumentError(ValueError):
@@ -233,38 +325,42 @@ class WrongNumberOfArgumentError(ValueError):
         super().__init__("object.__setattr__/setattr takes the wrong number of arguments.")
 
 
-@dataclass(frozen=True)
+_SETATTR_ARGUMENT_COUNT: Final = 3  # receiver, attribute name and value
+
+
 class SetattrFunctionContext:
-    """Normalise hook parameters from mypy's ``object.__setattr__`` callback (and its ``setattr`` twin)."""
+    """Normalise hook parameters from mypy's ``object.__setattr__`` callback (and its ``setattr`` twin).
 
-    name: Expression = field(init=False)
-    obj_type: Type = field(init=False)
-    name_type: Type = field(init=False)
-    value_type: Type = field(init=False)
+    Instantiated for every hooked call site, so it is a plain ``__slots__`` class rather than a frozen dataclass.
+    """
 
-    ctx: InitVar[FunctionContext | MethodContext]
+    __slots__ = ("name", "name_type", "obj_type", "value_type")
 
-    def __post_init__(self, ctx: FunctionContext | MethodContext) -> None:
+    name: Expression
+    obj_type: Type
+    name_type: Type
+    value_type: Type
+
+    def __init__(self, ctx: FunctionContext | MethodContext) -> None:
         """Extract positional and type information from the hook arguments.
 
         Args:
             ctx: Callback context containing the call arguments and inferred types.
 
+        Raises:
+            WrongNumberOfArgumentError: If the call does not pass exactly three positional arguments.
+
         """
-        match ctx.args:
-            case [[_obj], [name], [_value]]:
-                object.__setattr__(self, "name", name)
-            case _:
-                raise WrongNumberOfArgumentError
+        args: Final = ctx.args
+        if len(args) != _SETATTR_ARGUMENT_COUNT or len(args[0]) != 1 or len(args[1]) != 1 or len(args[2]) != 1:
+            raise WrongNumberOfArgumentError
 
-        match ctx.arg_types:
-            case [[obj_type], [name_type], [value_type]]:
-                object.__setattr__(self, "obj_type", obj_type)
-                object.__setattr__(self, "name_type", name_type)
-                object.__setattr__(self, "value_type", value_type)
-            case _:
-                # It does not seems to occur because firstly the exception is raised in "match ctx.args".
-                raise WrongNumberOfArgumentError
+        # ``arg_types`` always mirrors the shape of ``args``.
+        arg_types: Final = ctx.arg_types
+        self.name = args[1][0]
+        self.obj_type = arg_types[0][0]
+        self.name_type = arg_types[1][0]
+        self.value_type = arg_types[2][0]
 
     def ensure_literal_name_attribute(self) -> SetattrFunctionContextLiteralNameAttribute | None:
         """Return the literal attribute assignment when both name and receiver are statically known.
@@ -276,7 +372,10 @@ class SetattrFunctionContext:
         match (self.name, self.obj_type):
             case (StrExpr() as name, Instance() as obj_type):
                 return SetattrFunctionContextLiteralNameAttribute(
-                    name=name.value, obj_type=obj_type, value_type=self.value_type
+                    # Interned names let ``names.get`` and the lookup cache compare keys by identity.
+                    name=sys.intern(name.value),
+                    obj_type=obj_type,
+                    value_type=get_proper_type(self.value_type),
                 )
             case _:
                 return None
@@ -1,19 +1,27 @@
 from __future__ import annotations
 
 import sys
+from collections.abc import Callable, Iterable, Mapping
+from contextlib import redirect_stderr, redirect_stdout
+from functools import cache
+from io import StringIO
 from pathlib import Path
 from textwrap import dedent
-from typing import TYPE_CHECKING, Final, cast
+from typing import TYPE_CHECKING, Final, TypeGuard, cast
 
 import pytest
 from mypy import build
 from mypy.api import run as run_mypy
+from mypy.errors import CompileError
 from mypy.modulefinder import BuildSource
-from mypy.nodes import Expression, NameExpr, StrExpr, TypeInfo, Var
+from mypy.nodes import MDEF, Expression, MypyFile, NameExpr, StrExpr, SymbolTableNode, TypeInfo, Var
 from mypy.options import Options
-from mypy.types import Instance, NoneType
+from mypy.state import state
+from mypy.types import Instance, NoneType, UnionType
 from mypy.types import Type as MypyType
+from mypy.version import __version__ as mypy_version
 
+import mypy_setattr.plugin
 from mypy_setattr.plugin import (
     LiteralNameAttributeTypeCheckResultAttributeDoesNotExist,
     LiteralNameAttributeTypeCheckResultDoesNotSatisfyType,
@@ -23,9 +31,11 @@ from mypy_setattr.plugin import (
     LiteralNameAttributeTypeCheckResultSymbolNodeTypeIsNone,
     SetattrFunctionContext,
     SetattrFunctionContextLiteralNameAttribute,
+    SetattrPlugin,
     TypeDisplayFormatter,
     TypeInfoWrapper,
     WrongNumberOfArgumentError,
+    plugin,
 )
 
 if TYPE_CHECKING:
@@ -36,68 +46,186 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 
+@cache
+def _dedent(text: str) -> str:
+    # Test sources are string literals, so each one is dedented once per session.
+    return dedent(text)
+
+
 def write_sample(tmp_path: Path, code: str) -> Path:
     path = tmp_path / "sample.py"
-    path.write_text(dedent(code))
+    path.write_text(_dedent(code))
     return path
 
 
-def write_config(tmp_path: Path) -> Path:
-    config = tmp_path / "mypy.ini"
+@pytest.fixture(scope="session")
+def mypy_cache_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    # Shared by every run in the session (per worker under xdist), so incremental mode only analyses
+    # ``builtins``, ``typing`` and the plugin once instead of once per test.
+    return tmp_path_factory.mktemp("mypy_cache")
+
+
+@pytest.fixture(scope="session")
+def mypy_config(tmp_path_factory: pytest.TempPathFactory, mypy_cache_dir: Path) -> Path:
+    # The configuration never varies, so it is written once per session.
+    config = tmp_path_factory.mktemp("mypy_cfg", numbered=False) / "mypy.ini"
     config.write_text(
-        dedent(
-            """
+        _dedent(
+            f"""
             [mypy]
             plugins = mypy_setattr.plugin
             show_traceback = true
+            cache_dir = {mypy_cache_dir}
             """,
         ).lstrip(),
     )
     return config
 
 
-def run_with_plugin(tmp_path: Path, code: str) -> tuple[str, str, int]:
-    sample_path = write_sample(tmp_path, code)
-    config_path = write_config(tmp_path)
-    return run_mypy(["--config-file", str(config_path), str(sample_path)])
+@pytest.fixture(scope="session")
+def mypy_options(mypy_cache_dir: Path) -> Options:
+    options = Options()
+    options.show_traceback = True
+    options.cache_dir = str(mypy_cache_dir)
+    return options
+
+
+type MypyResult = tuple[str, str, int]
+type MypyResults = Mapping[str, MypyResult]
+
+MYPY_FATAL_EXIT: Final = 2  # exit code of the mypy command line for blocking and internal errors
+
+
+def run_with_plugin(options: Options, codes: Iterable[str]) -> MypyResults:
+    # Type-check the samples in a single in-memory build, one module per sample, and split the messages back per
+    # sample. A blocking error is reported against the sample it names and the others are checked again without
+    # it; an internal error makes each sample be checked on its own, so failures stay isolated per case.
+    modules: Final = {code: f"sample_{index}" for index, code in enumerate(dict.fromkeys(codes))}
+    results: Final[dict[str, MypyResult]] = {}
+    while modules:
+        report = StringIO()
+        try:
+            with redirect_stdout(report), redirect_stderr(report):
+                results.update(_check_samples(options, modules))
+        except CompileError as e:
+            blocked = [code for code, module in modules.items() if module == e.module_with_blocker] or list(modules)
+            for code in blocked:
+                results[code] = ("\n".join(e.messages), "", MYPY_FATAL_EXIT)
+                del modules[code]
+            continue
+        except SystemExit:  # internal error: mypy printed its report (traceback on stdout) and exited
+            if len(modules) == 1:
+                results.update(dict.fromkeys(modules, ("", report.getvalue(), MYPY_FATAL_EXIT)))
+            else:
+                for code in modules:
+                    results.update(run_with_plugin(options, [code]))
+        break
+    return results
+
+
+def _check_samples(options: Options, modules: Mapping[str, str]) -> dict[str, MypyResult]:
+    sources: Final = [BuildSource(f"{module}.py", module, _dedent(code)) for code, module in modules.items()]
+    # The plugin is passed directly, as mypy only reads ``plugins`` from a config file.
+    build_result: Final = build.build(sources, options, extra_plugins=[plugin(mypy_version)(options)])
+
+    messages: Final[dict[str, list[str]]] = {module: [] for module in modules.values()}
+    unattributed: Final[list[str]] = []
+    for message in build_result.errors:
+        messages.get(message.partition(".py:")[0], unattributed).append(message)
+
+    results: Final[dict[str, MypyResult]] = {}
+    for code, module in modules.items():
+        exit_code = 1 if any(": error: " in message for message in messages[module]) else 0
+        # Messages that belong to no sample cannot be told apart, so they fail every case of the build.
+        results[code] = (
+            "\n".join(messages[module]),
+            "\n".join(unattributed),
+            MYPY_FATAL_EXIT if unattributed else exit_code,
+        )
+    return results
+
+
+@pytest.fixture(scope="session")
+def mypy_batches(request: pytest.FixtureRequest, mypy_options: Options) -> Callable[[str], MypyResults]:
+    # Mypy start-up dominates a single small check, so the behaviour cases (the ``code`` parameter) of each test
+    # class are checked once, together, the first time one of them runs.
+    classes: Final[dict[object, list[str]]] = {}
+    for item in request.session.items:
+        if isinstance(item, pytest.Function) and hasattr(item, "callspec"):
+            code = item.callspec.params.get("code")
+            if isinstance(code, str):
+                classes.setdefault(item.parent, []).append(code)
+    batch_of: Final = {code: tuple(codes) for codes in classes.values() for code in codes}
+
+    @cache
+    def check_batch(codes: tuple[str, ...]) -> MypyResults:
+        return run_with_plugin(mypy_options, codes)
+
+    return lambda code: check_batch(batch_of[code])
+
+
+@pytest.fixture
+def mypy_batch(code: str, mypy_batches: Callable[[str], MypyResults]) -> MypyResults:
+    return mypy_batches(code)
 
 
 def assert_mypy_result(
-    tmp_path: Path,
+    results: MypyResults,
     code: str,
     *,
     expected_exit: int,
     expected_stdout_substring: str | None = None,
 ) -> tuple[str, str]:
-    stdout, stderr, exit_code = run_with_plugin(tmp_path, code)
+    stdout, stderr, exit_code = results[code]
     assert exit_code == expected_exit, stdout + stderr
     if expected_stdout_substring is not None:
         assert expected_stdout_substring in stdout
     return stdout, stderr
 
 
+# Builds are shared between tests with equivalent source, so the returned ``TypeInfo`` objects must not be
+# mutated; tests that do so use ``build_type_environment_uncached``.
 def build_type_environment(code: str) -> tuple[dict[str, TypeInfo], dict[str, TypeInfo]]:
+    return _build_type_environment_cached(_dedent(code).strip())
+
+
+@cache
+def _build_type_environment_cached(code: str) -> tuple[dict[str, TypeInfo], dict[str, TypeInfo]]:
+    return build_type_environment_uncached(code)
+
+
+@cache
+def _type_environment_options() -> Options:
+    # ``build.build`` does not mutate its options, so a single instance serves every build.
     options = Options()
     options.incremental = False
     options.show_traceback = True
-    build_result = build.build([BuildSource(None, "__main__", dedent(code))], options)
+    return options
+
+
+def build_type_environment_uncached(code: str) -> tuple[dict[str, TypeInfo], dict[str, TypeInfo]]:
+    build_result = build.build([BuildSource(None, "__main__", _dedent(code))], _type_environment_options())
     module_state = build_result.graph["__main__"]
     assert module_state.tree is not None
-    module_type_infos: dict[str, TypeInfo] = {}
-    for name, symbol in module_state.tree.names.items():
-        if isinstance(symbol.node, TypeInfo):
-            module_type_infos[name] = symbol.node
+    # ``TypeInfo`` has no subclasses, so an exact type check suffices.
+    module_type_infos = {
+        name: symbol.node for name, symbol in module_state.tree.names.items() if type(symbol.node) is TypeInfo
+    }
 
     builtins_state = build_result.graph["builtins"]
     assert builtins_state.tree is not None
-    builtin_type_infos: dict[str, TypeInfo] = {}
-    for name, symbol in builtins_state.tree.names.items():
-        if isinstance(symbol.node, TypeInfo):
-            builtin_type_infos[name] = symbol.node
+    builtin_type_infos = {
+        name: symbol.node for name, symbol in builtins_state.tree.names.items() if type(symbol.node) is TypeInfo
+    }
 
     return module_type_infos, builtin_type_infos
 
 
+def _is_var(node: object) -> TypeGuard[Var]:
+    # ``Var`` has no subclasses, so an exact type check suffices.
+    return type(node) is Var
+
+
 def instance(info: TypeInfo) -> Instance:
     return Instance(info, [])
 
@@ -106,495 +234,679 @@ def _as_plugin_context(obj: object) -> FunctionContext | MethodContext:
     return cast("FunctionContext | MethodContext", obj)
 
 
-class TestObjectSetattr:
-    class TestKnownAttributeAssignments:
-        class TestNormalClass:
-            def test_correct_literal_attribute_assignment(self, tmp_path: Path) -> None:
-                assert_mypy_result(
-                    tmp_path,
-                    """
-                    class User:
-                        name: str
-
-                    def update(user: User) -> None:
-                        object.__setattr__(user, "name", "Bob")
-                    """,
-                    expected_exit=0,
-                )
-
-            def test_wrong_literal_attribute_assignment(self, tmp_path: Path) -> None:
-                assert_mypy_result(
-                    tmp_path,
-                    """
-                    class User:
-                        name: str
+USER_CLASS: Final = """
+class User:
+    name: str
+    nickname: str | None
+"""
 
-                    def update(user: User) -> None:
-                        object.__setattr__(user, "name", 1)
-                    """,
-                    expected_exit=1,
-                    expected_stdout_substring='attribute "name"',
-                )
+BASE_CLASS: Final = """
+class Base:
+    name: str
 
-            def test_optional_value_assignment(self, tmp_path: Path) -> None:
-                assert_mypy_result(
-                    tmp_path,
-                    """
-                    class User:
-                        nickname: str | None
+class User(Base):
+    pass
+"""
 
-                    def update(user: User) -> None:
-                        object.__setattr__(user, "nickname", None)
-                    """,
-                    expected_exit=0,
-                )
+TWO_BASES_CLASS: Final = """
+class Named:
+    name: str
 
-        class TestInheritedClass:
-            def test_correct_attribute_assignment_from_second_base(self, tmp_path: Path) -> None:
-                assert_mypy_result(
-                    tmp_path,
-                    """
-                    class Named:
-                        name: str
+class Timestamped:
+    created_at: int
 
-                    class Timestamped:
-                        created_at: int
+class User(Named, Timestamped):
+    pass
+"""
 
-                    class User(Named, Timestamped):
-                        pass
+DATACLASS: Final = """
+from dataclasses import dataclass
 
-                    def update(user: User) -> None:
-                        object.__setattr__(user, "created_at", 11)
-                    """,
-                    expected_exit=0,
-                )
+@dataclass
+class User:
+    name: str
+    nickname: str | None
+"""
 
-            def test_wrong_attribute_assignment_from_second_base(self, tmp_path: Path) -> None:
-                assert_mypy_result(
-                    tmp_path,
-                    """
-                    class Named:
-                        name: str
+CASE_PARAMETERS: Final = ("code", "expected_exit", "expected_stdout_substring")
 
-                    class Timestamped:
-                        created_at: int
 
-                    class User(Named, Timestamped):
-                        pass
+def update_function_sample(class_source: str, call: str) -> str:
+    return f"{_dedent(class_source)}\n\ndef update(user: User) -> None:\n    {call}\n"
 
-                    def update(user: User) -> None:
-                        object.__setattr__(user, "created_at", "oops")
-                    """,
-                    expected_exit=1,
-                    expected_stdout_substring='attribute "created_at"',
-                )
 
-    class TestDataclassAssignments:
-        class TestMutableDataclass:
-            def test_correct_literal_assignment(self, tmp_path: Path) -> None:
+class TestObjectSetattr:
+    class TestKnownAttributeAssignments:
+        class TestNormalClass:
+            @pytest.mark.parametrize(
+                CASE_PARAMETERS,
+                [
+                    pytest.param(
+                        update_function_sample(USER_CLASS, 'object.__setattr__(user, "name", "Bob")'),
+                        0,
+                        None,
+                        id="correct_literal_attribute_assignment",
+                    ),
+                    pytest.param(
+                        update_function_sample(USER_CLASS, 'object.__setattr__(user, "name", 1)'),
+                        1,
+                        'attribute "name"',
+                        id="wrong_literal_attribute_assignment",
+                    ),
+                    pytest.param(
+                        update_function_sample(USER_CLASS, 'object.__setattr__(user, "nickname", None)'),
+                        0,
+                        None,
+                        id="optional_value_assignment",
+                    ),
+                ],
+            )
+            def test_assignment(
+                self,
+                mypy_batch: MypyResults,
+                code: str,
+                expected_exit: int,
+                expected_stdout_substring: str | None,
+            ) -> None:
                 assert_mypy_result(
-                    tmp_path,
-                    """
-                    from dataclasses import dataclass
-
-                    @dataclass
-                    class User:
-                        name: str
-
-                    def update(user: User) -> None:
-                        object.__setattr__(user, "name", "Bob")
-                    """,
-                    expected_exit=0,
+                    mypy_batch,
+                    code,
+                    expected_exit=expected_exit,
+                    expected_stdout_substring=expected_stdout_substring,
                 )
 
-            def test_wrong_literal_assignment(self, tmp_path: Path) -> None:
+        class TestInheritedClass:
+            @pytest.mark.parametrize(
+                CASE_PARAMETERS,
+                [
+                    pytest.param(
+                        update_function_sample(TWO_BASES_CLASS, 'object.__setattr__(user, "created_at", 11)'),
+                        0,
+                        None,
+                        id="correct_attribute_assignment_from_second_base",
+                    ),
+                    pytest.param(
+                        update_function_sample(TWO_BASES_CLASS, 'object.__setattr__(user, "created_at", "oops")'),
+                        1,
+                        'attribute "created_at"',
+                        id="wrong_attribute_assignment_from_second_base",
+                    ),
+                ],
+            )
+            def test_assignment(
+                self,
+                mypy_batch: MypyResults,
+                code: str,
+                expected_exit: int,
+                expected_stdout_substring: str | None,
+            ) -> None:
                 assert_mypy_result(
-                    tmp_path,
-                    """
-                    from dataclasses import dataclass
-
-                    @dataclass
-                    class User:
-                        name: str
-
-                    def update(user: User) -> None:
-                        object.__setattr__(user, "name", 1)
-                    """,
-                    expected_exit=1,
-                    expected_stdout_substring='attribute "name"',
+                    mypy_batch,
+                    code,
+                    expected_exit=expected_exit,
+                    expected_stdout_substring=expected_stdout_substring,
                 )
 
-            def test_optional_assignment(self, tmp_path: Path) -> None:
+    class TestDataclassAssignments:
+        class TestMutableDataclass:
+            @pytest.mark.parametrize(
+                CASE_PARAMETERS,
+                [
+                    pytest.param(
+                        update_function_sample(DATACLASS, 'object.__setattr__(user, "name", "Bob")'),
+                        0,
+                        None,
+                        id="correct_literal_assignment",
+                    ),
+                    pytest.param(
+                        update_function_sample(DATACLASS, 'object.__setattr__(user, "name", 1)'),
+                        1,
+                        'attribute "name"',
+                        id="wrong_literal_assignment",
+                    ),
+                    pytest.param(
+                        update_function_sample(DATACLASS, 'object.__setattr__(user, "nickname", None)'),
+                        0,
+                        None,
+                        id="optional_assignment",
+                    ),
+                ],
+            )
+            def test_assignment(
+                self,
+                mypy_batch: MypyResults,
+                code: str,
+                expected_exit: int,
+                expected_stdout_substring: str | None,
+            ) -> None:
                 assert_mypy_result(
-                    tmp_path,
-                    """
-                    from dataclasses import dataclass
-
-                    @dataclass
-                    class User:
-                        nickname: str | None
-
-                    def update(user: User) -> None:
-                        object.__setattr__(user, "nickname", None)
-                    """,
-                    expected_exit=0,
+                    mypy_batch,
+                    code,
+                    expected_exit=expected_exit,
+                    expected_stdout_substring=expected_stdout_substring,
                 )
 
         class TestFrozenDataclassPostInit:
-            def test_wrong_literal_assignment_in_post_init(self, tmp_path: Path) -> None:
-                assert_mypy_result(
-                    tmp_path,
-                    """
-                    from dataclasses import dataclass
-
-                    @dataclass(frozen=True)
-                    class User:
-                        name: str
-
-                        def __post_init__(self) -> None:
-                            object.__setattr__(self, "name", 1)
-                    """,
-                    expected_exit=1,
-                    expected_stdout_substring='attribute "name"',
-                )
-
-            def test_wrong_second_base_assignment_in_post_init(self, tmp_path: Path) -> None:
-                assert_mypy_result(
-                    tmp_path,
-                    """
-                    from dataclasses import dataclass
-
-                    @dataclass(frozen=True)
-                    class Named:
-                        name: str
-
-                    @dataclass(frozen=True)
-                    class Timestamped:
-                        created_at: int
-
-                    @dataclass(frozen=True)
-                    class User(Named, Timestamped):
-                        def __post_init__(self) -> None:
-                            object.__setattr__(self, "created_at", "oops")
-                    """,
-                    expected_exit=1,
-                    expected_stdout_substring='attribute "created_at"',
-                )
-
-            def test_optional_assignment_in_post_init(self, tmp_path: Path) -> None:
+            @pytest.mark.parametrize(
+                CASE_PARAMETERS,
+                [
+                    pytest.param(
+                        """
+                            from dataclasses import dataclass
+
+                            @dataclass(frozen=True)
+                            class User:
+                                name: str
+
+                                def __post_init__(self) -> None:
+                                    object.__setattr__(self, "name", 1)
+                        """,
+                        1,
+                        'attribute "name"',
+                        id="wrong_literal_assignment_in_post_init",
+                    ),
+                    pytest.param(
+                        """
+                            from dataclasses import dataclass
+
+                            @dataclass(frozen=True)
+                            class Named:
+                                name: str
+
+                            @dataclass(frozen=True)
+                            class Timestamped:
+                                created_at: int
+
+                            @dataclass(frozen=True)
+                            class User(Named, Timestamped):
+                                def __post_init__(self) -> None:
+                                    object.__setattr__(self, "created_at", "oops")
+                        """,
+                        1,
+                        'attribute "created_at"',
+                        id="wrong_second_base_assignment_in_post_init",
+                    ),
+                    pytest.param(
+                        """
+                            from dataclasses import dataclass
+
+                            @dataclass(frozen=True)
+                            class User:
+                                nickname: str | None
+
+                                def __post_init__(self) -> None:
+                                    object.__setattr__(self, "nickname", None)
+                        """,
+                        0,
+                        None,
+                        id="optional_assignment_in_post_init",
+                    ),
+                    pytest.param(
+                        """
+                            from dataclasses import dataclass
+
+                            class A: ...
+
+                            class B(A): ...
+
+                            def make() -> "Box[B]":
+                                raise NotImplementedError
+
+                            @dataclass(frozen=True)
+                            class Early:
+                                box: "Box[A]"
+
+                                def __post_init__(self) -> None:
+                                    object.__setattr__(self, "box", make())
+
+                            class Box[T]:
+                                def __init__(self, value: T) -> None:
+                                    self._value = value
+
+                                @property
+                                def value(self) -> T:
+                                    return self._value
+
+                                @value.setter
+                                def value(self, value: T) -> None:
+                                    self._value = value
+
+                            @dataclass(frozen=True)
+                            class Late:
+                                box: Box[A]
+
+                                def __post_init__(self) -> None:
+                                    object.__setattr__(self, "box", make())
+                        """,
+                        1,
+                        '.Late; expected "',
+                        id="invariant_generic_assignment_after_variance_is_inferred",
+                    ),
+                ],
+            )
+            def test_assignment_in_post_init(
+                self,
+                mypy_batch: MypyResults,
+                code: str,
+                expected_exit: int,
+                expected_stdout_substring: str | None,
+            ) -> None:
                 assert_mypy_result(
-                    tmp_path,
-                    """
-                    from dataclasses import dataclass
-
-                    @dataclass(frozen=True)
-                    class User:
-                        nickname: str | None
-
-                        def __post_init__(self) -> None:
-                            object.__setattr__(self, "nickname", None)
-                    """,
-                    expected_exit=0,
+                    mypy_batch,
+                    code,
+                    expected_exit=expected_exit,
+                    expected_stdout_substring=expected_stdout_substring,
                 )
 
     class TestMissingAttributes:
-        def test_reports_missing_attribute(self, tmp_path: Path) -> None:
+        @pytest.mark.parametrize(
+            CASE_PARAMETERS,
+            [
+                pytest.param(
+                    update_function_sample(USER_CLASS, 'object.__setattr__(user, "age", 1)'),
+                    1,
+                    'attribute "age"',
+                    id="reports_missing_attribute",
+                ),
+            ],
+        )
+        def test_missing_attribute(
+            self,
+            mypy_batch: MypyResults,
+            code: str,
+            expected_exit: int,
+            expected_stdout_substring: str | None,
+        ) -> None:
             assert_mypy_result(
-                tmp_path,
-                """
-                class User:
-                    name: str
-
-                def update(user: User) -> None:
-                    object.__setattr__(user, "age", 1)
-                """,
-                expected_exit=1,
-                expected_stdout_substring='attribute "age"',
+                mypy_batch,
+                code,
+                expected_exit=expected_exit,
+                expected_stdout_substring=expected_stdout_substring,
             )
 
     class TestWrongUsageOfSetattr:
-        def test_reports_error_when_value_argument_is_missing(self, tmp_path: Path) -> None:
+        @pytest.mark.parametrize(
+            CASE_PARAMETERS,
+            [
+                pytest.param(
+                    update_function_sample(USER_CLASS, 'object.__setattr__(user, "name")'),
+                    1,
+                    'Too few arguments for "__setattr__"',
+                    id="reports_error_when_value_argument_is_missing",
+                ),
+                pytest.param(
+                    update_function_sample(USER_CLASS, 'object.__setattr__(user, "name", "Bob", "extra")'),
+                    1,
+                    'Too many arguments for "__setattr__"',
+                    id="reports_error_when_too_many_arguments_are_passed",
+                ),
+            ],
+        )
+        def test_wrong_usage(
+            self,
+            mypy_batch: MypyResults,
+            code: str,
+            expected_exit: int,
+            expected_stdout_substring: str | None,
+        ) -> None:
             assert_mypy_result(
-                tmp_path,
-                """
-                class User:
-                    name: str
-
-                def update(user: User) -> None:
-                    object.__setattr__(user, "name")
-                """,
-                expected_exit=1,
-                expected_stdout_substring='Too few arguments for "__setattr__"',
+                mypy_batch,
+                code,
+                expected_exit=expected_exit,
+                expected_stdout_substring=expected_stdout_substring,
             )
 
-        def test_reports_error_when_too_many_arguments_are_passed(self, tmp_path: Path) -> None:
-            assert_mypy_result(
-                tmp_path,
-                """
-                class User:
-                    name: str
-
-                def update(user: User) -> None:
-                    object.__setattr__(user, "name", "Bob", "extra")
-                """,
+        @pytest.mark.parametrize(
+            "code",
+            [
+                pytest.param(
+                    update_function_sample(USER_CLASS, "object.__setattr__(user, user.name)"),
+                    id="leaves_dynamic_name_arity_errors_to_mypy",
+                ),
+            ],
+        )
+        def test_wrong_usage_with_dynamic_name(self, mypy_batch: MypyResults, code: str) -> None:
+            # Calls with a non-literal name return before the plugin inspects the argument count.
+            stdout, _ = assert_mypy_result(
+                mypy_batch,
+                code,
                 expected_exit=1,
-                expected_stdout_substring='Too many arguments for "__setattr__"',
+                expected_stdout_substring='Too few arguments for "__setattr__"',
             )
+            assert "takes the wrong number of arguments" not in stdout
 
 
 class TestSetattr:
     class TestKnownAttributeAssignments:
         class TestNormalClass:
-            def test_correct_attribute_assignment_from_class_body(self, tmp_path: Path) -> None:
-                assert_mypy_result(
-                    tmp_path,
-                    """
-                    class User:
-                        name: str
-
-                    def update(user: User) -> None:
-                        setattr(user, "name", "Bob")
-                    """,
-                    expected_exit=0,
-                )
-
-            def test_wrong_attribute_assignment_from_class_body(self, tmp_path: Path) -> None:
-                assert_mypy_result(
-                    tmp_path,
-                    """
-                    class User:
-                        name: str
-
-                    def update(user: User) -> None:
-                        setattr(user, "name", 1)
-                    """,
-                    expected_exit=1,
-                    expected_stdout_substring='attribute "name"',
-                )
-
-            def test_optional_value_assignment(self, tmp_path: Path) -> None:
-                assert_mypy_result(
-                    tmp_path,
-                    """
-                    class User:
-                        nickname: str | None
-
-                    def update(user: User) -> None:
-                        setattr(user, "nickname", None)
-                    """,
-                    expected_exit=0,
-                )
-
-            def test_any_typed_attribute(self, tmp_path: Path) -> None:
+            @pytest.mark.parametrize(
+                CASE_PARAMETERS,
+                [
+                    pytest.param(
+                        update_function_sample(USER_CLASS, 'setattr(user, "name", "Bob")'),
+                        0,
+                        None,
+                        id="correct_attribute_assignment_from_class_body",
+                    ),
+                    pytest.param(
+                        update_function_sample(USER_CLASS, 'setattr(user, "name", 1)'),
+                        1,
+                        'attribute "name"',
+                        id="wrong_attribute_assignment_from_class_body",
+                    ),
+                    pytest.param(
+                        update_function_sample(USER_CLASS, 'setattr(user, "nickname", None)'),
+                        0,
+                        None,
+                        id="optional_value_assignment",
+                    ),
+                    pytest.param(
+                        """
+                            from typing import Any
+
+                            class User:
+                                data: Any
+
+                            def update(user: User) -> None:
+                                setattr(user, "data", 1)
+                        """,
+                        0,
+                        None,
+                        id="any_typed_attribute",
+                    ),
+                ],
+            )
+            def test_assignment(
+                self,
+                mypy_batch: MypyResults,
+                code: str,
+                expected_exit: int,
+                expected_stdout_substring: str | None,
+            ) -> None:
                 assert_mypy_result(
-                    tmp_path,
-                    """
-                    from typing import Any
-
-                    class User:
-                        data: Any
-
-                    def update(user: User) -> None:
-                        setattr(user, "data", 1)
-                    """,
-                    expected_exit=0,
+                    mypy_batch,
+                    code,
+                    expected_exit=expected_exit,
+                    expected_stdout_substring=expected_stdout_substring,
                 )
 
         class TestInheritedClass:
-            def test_correct_attribute_assignment_from_base_class(self, tmp_path: Path) -> None:
-                assert_mypy_result(
-                    tmp_path,
-                    """
-                    class Base:
-                        name: str
-
-                    class User(Base):
-                        pass
-
-                    def update(user: User) -> None:
-                        setattr(user, "name", "Bob")
-                    """,
-                    expected_exit=0,
-                )
-
-            def test_wrong_attribute_assignment_from_base_class(self, tmp_path: Path) -> None:
-                assert_mypy_result(
-                    tmp_path,
-                    """
-                    class Base:
-                        name: str
-
-                    class User(Base):
-                        pass
-
-                    def update(user: User) -> None:
-                        setattr(user, "name", 1)
-                    """,
-                    expected_exit=1,
-                    expected_stdout_substring='attribute "name"',
-                )
-
-            def test_correct_attribute_assignment_from_second_base(self, tmp_path: Path) -> None:
-                assert_mypy_result(
-                    tmp_path,
-                    """
-                    class Named:
-                        name: str
-
-                    class Timestamped:
-                        created_at: int
-
-                    class User(Named, Timestamped):
-                        pass
-
-                    def update(user: User) -> None:
-                        setattr(user, "created_at", 11)
-                    """,
-                    expected_exit=0,
-                )
-
-            def test_wrong_attribute_assignment_from_second_base(self, tmp_path: Path) -> None:
+            @pytest.mark.parametrize(
+                CASE_PARAMETERS,
+                [
+                    pytest.param(
+                        update_function_sample(BASE_CLASS, 'setattr(user, "name", "Bob")'),
+                        0,
+                        None,
+                        id="correct_attribute_assignment_from_base_class",
+                    ),
+                    pytest.param(
+                        update_function_sample(BASE_CLASS, 'setattr(user, "name", 1)'),
+                        1,
+                        'attribute "name"',
+                        id="wrong_attribute_assignment_from_base_class",
+                    ),
+                    pytest.param(
+                        update_function_sample(TWO_BASES_CLASS, 'setattr(user, "created_at", 11)'),
+                        0,
+                        None,
+                        id="correct_attribute_assignment_from_second_base",
+                    ),
+                    pytest.param(
+                        update_function_sample(TWO_BASES_CLASS, 'setattr(user, "created_at", "oops")'),
+                        1,
+                        'attribute "created_at"',
+                        id="wrong_attribute_assignment_from_second_base",
+                    ),
+                ],
+            )
+            def test_assignment(
+                self,
+                mypy_batch: MypyResults,
+                code: str,
+                expected_exit: int,
+                expected_stdout_substring: str | None,
+            ) -> None:
                 assert_mypy_result(
-                    tmp_path,
-                    """
-                    class Named:
-                        name: str
-
-                    class Timestamped:
-                        created_at: int
-
-                    class User(Named, Timestamped):
-                        pass
-
-                    def update(user: User) -> None:
-                        setattr(user, "created_at", "oops")
-                    """,
-                    expected_exit=1,
-                    expected_stdout_substring='attribute "created_at"',
+                    mypy_batch,
+                    code,
+                    expected_exit=expected_exit,
+                    expected_stdout_substring=expected_stdout_substring,
                 )
 
         class TestDataclass:
-            def test_correct_attribute_assignment_in_dataclass(self, tmp_path: Path) -> None:
-                assert_mypy_result(
-                    tmp_path,
-                    """
-                    from dataclasses import dataclass
-
-                    @dataclass
-                    class User:
-                        name: str
-
-                    def update(user: User) -> None:
-                        setattr(user, "name", "Bob")
-                    """,
-                    expected_exit=0,
-                )
-
-            def test_wrong_attribute_assignment_in_dataclass(self, tmp_path: Path) -> None:
+            @pytest.mark.parametrize(
+                CASE_PARAMETERS,
+                [
+                    pytest.param(
+                        update_function_sample(DATACLASS, 'setattr(user, "name", "Bob")'),
+                        0,
+                        None,
+                        id="correct_attribute_assignment_in_dataclass",
+                    ),
+                    pytest.param(
+                        update_function_sample(DATACLASS, 'setattr(user, "name", 1)'),
+                        1,
+                        'attribute "name"',
+                        id="wrong_attribute_assignment_in_dataclass",
+                    ),
+                ],
+            )
+            def test_assignment(
+                self,
+                mypy_batch: MypyResults,
+                code: str,
+                expected_exit: int,
+                expected_stdout_substring: str | None,
+            ) -> None:
                 assert_mypy_result(
-                    tmp_path,
-                    """
-                    from dataclasses import dataclass
-
-                    @dataclass
-                    class User:
-                        name: str
-
-                    def update(user: User) -> None:
-                        setattr(user, "name", 1)
-                    """,
-                    expected_exit=1,
-                    expected_stdout_substring='attribute "name"',
+                    mypy_batch,
+                    code,
+                    expected_exit=expected_exit,
+                    expected_stdout_substring=expected_stdout_substring,
                 )
 
     class TestMissingAttributes:
-        def test_reports_missing_attribute(self, tmp_path: Path) -> None:
+        @pytest.mark.parametrize(
+            CASE_PARAMETERS,
+            [
+                pytest.param(
+                    update_function_sample(USER_CLASS, 'setattr(user, "age", 1)'),
+                    1,
+                    'attribute "age"',
+                    id="reports_missing_attribute",
+                ),
+            ],
+        )
+        def test_missing_attribute(
+            self,
+            mypy_batch: MypyResults,
+            code: str,
+            expected_exit: int,
+            expected_stdout_substring: str | None,
+        ) -> None:
             assert_mypy_result(
-                tmp_path,
-                """
-                class User:
-                    name: str
-
-                def update(user: User) -> None:
-                    setattr(user, "age", 1)
-                """,
-                expected_exit=1,
-                expected_stdout_substring='attribute "age"',
+                mypy_batch,
+                code,
+                expected_exit=expected_exit,
+                expected_stdout_substring=expected_stdout_substring,
             )
 
     class TestLiteralConstraints:
-        def test_literal_union_assignment(self, tmp_path: Path) -> None:
-            assert_mypy_result(
-                tmp_path,
-                """
-                from typing import Literal
+        @pytest.mark.parametrize(
+            CASE_PARAMETERS,
+            [
+                pytest.param(
+                    """
+                        from typing import Literal
 
-                class User:
-                    alias: Literal["aaa", "bbb"]
+                        class User:
+                            alias: Literal["aaa", "bbb"]
 
-                def update(user: User) -> None:
-                    setattr(user, "alias", "ccc")
-                """,
-                expected_exit=1,
-                expected_stdout_substring='attribute "alias"',
+                        def update(user: User) -> None:
+                            setattr(user, "alias", "ccc")
+                    """,
+                    1,
+                    'attribute "alias"',
+                    id="literal_union_assignment",
+                ),
+            ],
+        )
+        def test_literal_assignment(
+            self,
+            mypy_batch: MypyResults,
+            code: str,
+            expected_exit: int,
+            expected_stdout_substring: str | None,
+        ) -> None:
+            assert_mypy_result(
+                mypy_batch,
+                code,
+                expected_exit=expected_exit,
+                expected_stdout_substring=expected_stdout_substring,
             )
 
         class TestDynamicAttributeName:
-            def test_dynamic_attribute_name(self, tmp_path: Path) -> None:
+            @pytest.mark.parametrize(
+                CASE_PARAMETERS,
+                [
+                    pytest.param(
+                        """
+                            class User:
+                                name: str
+
+                            def update(user: User, field: str) -> None:
+                                setattr(user, field, 1)
+                        """,
+                        0,
+                        None,
+                        id="dynamic_attribute_name",
+                    ),
+                ],
+            )
+            def test_dynamic_attribute_name(
+                self,
+                mypy_batch: MypyResults,
+                code: str,
+                expected_exit: int,
+                expected_stdout_substring: str | None,
+            ) -> None:
                 assert_mypy_result(
-                    tmp_path,
-                    """
-                class User:
-                    name: str
-
-                def update(user: User, field: str) -> None:
-                    setattr(user, field, 1)
-                """,
-                    expected_exit=0,
+                    mypy_batch,
+                    code,
+                    expected_exit=expected_exit,
+                    expected_stdout_substring=expected_stdout_substring,
                 )
 
     class TestWrongUsageOfSetattr:
-        def test_reports_error_when_value_argument_is_missing(self, tmp_path: Path) -> None:
+        @pytest.mark.parametrize(
+            CASE_PARAMETERS,
+            [
+                pytest.param(
+                    update_function_sample(USER_CLASS, 'setattr(user, "name")'),
+                    1,
+                    'Too few arguments for "setattr"',
+                    id="reports_error_when_value_argument_is_missing",
+                ),
+                pytest.param(
+                    update_function_sample(USER_CLASS, 'setattr(user, "name", "Bob", "extra")'),
+                    1,
+                    'Too many arguments for "setattr"',
+                    id="reports_error_when_too_many_arguments_are_passed",
+                ),
+            ],
+        )
+        def test_wrong_usage(
+            self,
+            mypy_batch: MypyResults,
+            code: str,
+            expected_exit: int,
+            expected_stdout_substring: str | None,
+        ) -> None:
             assert_mypy_result(
-                tmp_path,
-                """
-                class User:
-                    name: str
-
-                def update(user: User) -> None:
-                    setattr(user, "name")
-                """,
-                expected_exit=1,
-                expected_stdout_substring='Too few arguments for "setattr"',
+                mypy_batch,
+                code,
+                expected_exit=expected_exit,
+                expected_stdout_substring=expected_stdout_substring,
             )
 
-        def test_reports_error_when_too_many_arguments_are_passed(self, tmp_path: Path) -> None:
-            assert_mypy_result(
-                tmp_path,
-                """
-                class User:
-                    name: str
-
-                def update(user: User) -> None:
-                    setattr(user, "name", "Bob", "extra")
-                """,
+        @pytest.mark.parametrize(
+            "code",
+            [
+                pytest.param(
+                    update_function_sample(USER_CLASS, "setattr(user, user.name)"),
+                    id="leaves_dynamic_name_arity_errors_to_mypy",
+                ),
+            ],
+        )
+        def test_wrong_usage_with_dynamic_name(self, mypy_batch: MypyResults, code: str) -> None:
+            # Calls with a non-literal name return before the plugin inspects the argument count.
+            stdout, _ = assert_mypy_result(
+                mypy_batch,
+                code,
                 expected_exit=1,
-                expected_stdout_substring='Too many arguments for "setattr"',
+                expected_stdout_substring='Too few arguments for "setattr"',
             )
+            assert "takes the wrong number of arguments" not in stdout
+
+
+class TestPluginEntryPoint:
+    def test_plugin_is_loaded_from_config_file(self, tmp_path: Path, mypy_config: Path) -> None:
+        sample_path = write_sample(tmp_path, update_function_sample(USER_CLASS, 'setattr(user, "name", 1)'))
+        stdout, stderr, exit_code = run_mypy(["--config-file", str(mypy_config), str(sample_path)])
+        assert exit_code == 1, stdout + stderr
+        assert 'attribute "name"' in stdout
+
+
+class TestRunWithPlugin:
+    def test_blocking_error_is_reported_only_against_its_sample(self, mypy_options: Options) -> None:
+        valid = update_function_sample(USER_CLASS, 'object.__setattr__(user, "name", 1)')
+        results = run_with_plugin(mypy_options, [valid, "x = (\n"])
+        stdout, _, exit_code = results[valid]
+        assert exit_code == 1, stdout
+        assert 'attribute "name"' in stdout
+        assert results["x = (\n"][2] == MYPY_FATAL_EXIT
+
+    def test_internal_error_is_reported_only_against_its_sample(
+        self,
+        mypy_options: Options,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        def crashing_hook(_ctx: FunctionContext | MethodContext) -> MypyType:
+            message = "plugin crashed"
+            raise RuntimeError(message)
+
+        hooks = mypy_setattr.plugin._FUNCTION_HOOKS  # noqa: SLF001  # pyright: ignore[reportPrivateUsage]
+        monkeypatch.setitem(hooks, "builtins.setattr", crashing_hook)
+        valid = update_function_sample(USER_CLASS, 'object.__setattr__(user, "name", 1)')
+        crashing = update_function_sample(USER_CLASS, 'setattr(user, "name", 1)')
+        results = run_with_plugin(mypy_options, [valid, crashing])
+
+        stdout, _, exit_code = results[valid]
+        assert exit_code == 1, stdout
+        assert 'attribute "name"' in stdout
+        _, stderr, exit_code = results[crashing]
+        assert exit_code == MYPY_FATAL_EXIT
+        assert "INTERNAL ERROR" in stderr
+        assert "RuntimeError: plugin crashed" in stderr
+
+
+@pytest.fixture(scope="class")
+def user_wrapper() -> TypeInfoWrapper:
+    module_infos, _ = build_type_environment(
+        """
+        class User:
+            name: str
+        """
+    )
+    return TypeInfoWrapper(module_infos["User"])
 
 
 class TestTypeInfoWrapper:
-    def test_by_name_resolves_defined_attribute(self) -> None:
-        module_infos, _ = build_type_environment(
-            """
-            class User:
-                name: str
-            """
-        )
-        wrapper = TypeInfoWrapper(module_infos["User"])
-        symbol = wrapper.by_name("name")
+    def test_by_name_resolves_defined_attribute(self, user_wrapper: TypeInfoWrapper) -> None:
+        symbol = user_wrapper.by_name("name")
         assert symbol is not None
-        assert isinstance(symbol.node, Var)
+        assert _is_var(symbol.node)
 
     def test_by_name_walks_mro(self) -> None:
         module_infos, _ = build_type_environment(
@@ -609,17 +921,27 @@ class TestTypeInfoWrapper:
         wrapper = TypeInfoWrapper(module_infos["User"])
         symbol = wrapper.by_name("created_at")
         assert symbol is not None
-        assert isinstance(symbol.node, Var)
+        assert _is_var(symbol.node)
 
-    def test_by_name_returns_none_when_missing(self) -> None:
-        module_infos, _ = build_type_environment(
+    def test_by_name_returns_none_when_missing(self, user_wrapper: TypeInfoWrapper) -> None:
+        assert user_wrapper.by_name("missing") is None
+
+    def test_by_name_cache_is_reset_when_modules_are_reloaded(self) -> None:
+        module_infos, _ = build_type_environment_uncached(
             """
             class User:
                 name: str
             """
         )
-        wrapper = TypeInfoWrapper(module_infos["User"])
-        assert wrapper.by_name("missing") is None
+        user_info = module_infos["User"]
+        wrapper = TypeInfoWrapper(user_info)
+        assert wrapper.by_name("age") is None
+
+        user_info.names["age"] = SymbolTableNode(MDEF, Var("age"))
+        assert wrapper.by_name("age") is None
+
+        SetattrPlugin(Options()).get_additional_deps(MypyFile([], []))
+        assert wrapper.by_name("age") is user_info.names["age"]
 
 
 class TestLiteralNameAttributeTypeCheckResultErrorHandler:
@@ -653,7 +975,7 @@ class TestLiteralNameAttributeTypeCheckResultErrorHandler:
         assert handler.message() == 'attribute "rename" on __main__.User is not a data attribute'
 
     def test_reports_attribute_without_type(self) -> None:
-        module_infos, _ = build_type_environment(
+        module_infos, _ = build_type_environment_uncached(
             """
             class User:
                 name: str
@@ -661,7 +983,7 @@ class TestLiteralNameAttributeTypeCheckResultErrorHandler:
         )
         user_info = module_infos["User"]
         var = user_info.names["name"].node
-        assert isinstance(var, Var)
+        assert _is_var(var)
         var.type = None
 
         user_instance = instance(user_info)
@@ -692,6 +1014,53 @@ class TestLiteralNameAttributeTypeCheckResultErrorHandler:
         )
         assert handler.message() == expected_message
 
+    def test_reports_union_members_in_declared_order(self) -> None:
+        module_infos, builtin_infos = build_type_environment(
+            """
+            class User:
+                name: str
+            """
+        )
+        user_instance = instance(module_infos["User"])
+        int_instance = instance(builtin_infos["int"])
+        str_instance = instance(builtin_infos["str"])
+        # ``UnionType`` compares its items as a set, so both orders are equal but must render differently.
+        for first, second in ((int_instance, str_instance), (str_instance, int_instance)):
+            handler = LiteralNameAttributeTypeCheckResultErrorHandler(
+                error=LiteralNameAttributeTypeCheckResultDoesNotSatisfyType(
+                    "name",
+                    user_instance,
+                    expected=UnionType([first, second]),
+                    actual=instance(builtin_infos["bytes"]),
+                ),
+            )
+            assert handler.message().endswith(f'expected "{first} | {second}"')
+
+    def test_reports_receiver_union_arguments_in_declared_order(self) -> None:
+        module_infos, builtin_infos = build_type_environment(
+            """
+            from typing import Generic, TypeVar
+
+            T = TypeVar("T")
+
+            class Box(Generic[T]):
+                x: int
+            """
+        )
+        int_instance = instance(builtin_infos["int"])
+        str_instance = instance(builtin_infos["str"])
+        # Receivers differing only in union order are equal, yet each message must name its own receiver.
+        for first, second in ((int_instance, str_instance), (str_instance, int_instance)):
+            handler = LiteralNameAttributeTypeCheckResultErrorHandler(
+                error=LiteralNameAttributeTypeCheckResultDoesNotSatisfyType(
+                    "x",
+                    Instance(module_infos["Box"], [UnionType([first, second])]),
+                    expected=int_instance,
+                    actual=str_instance,
+                ),
+            )
+            assert f"on __main__.Box[{first} | {second}];" in handler.message()
+
 
 class TestSetattrFunctionContextLiteralNameAttribute:
     def test_check_type_succeeds_for_matching_assignment(self) -> None:
@@ -745,7 +1114,7 @@ class TestSetattrFunctionContextLiteralNameAttribute:
         assert isinstance(result, LiteralNameAttributeTypeCheckResultSymbolIsNotVariable)
 
     def test_check_type_reports_attribute_without_type_information(self) -> None:
-        module_infos, builtin_infos = build_type_environment(
+        module_infos, builtin_infos = build_type_environment_uncached(
             """
             class User:
                 name: str
@@ -753,7 +1122,7 @@ class TestSetattrFunctionContextLiteralNameAttribute:
         )
         user_info = module_infos["User"]
         var = user_info.names["name"].node
-        assert isinstance(var, Var)
+        assert _is_var(var)
         var.type = None
 
         attribute = SetattrFunctionContextLiteralNameAttribute(
@@ -781,6 +1150,25 @@ class TestSetattrFunctionContextLiteralNameAttribute:
         result = attribute.check_type()
         assert isinstance(result, LiteralNameAttributeTypeCheckResultDoesNotSatisfyType)
 
+    def test_check_type_respects_strict_optional_setting(self) -> None:
+        module_infos, _ = build_type_environment(
+            """
+            class User:
+                name: str
+            """
+        )
+        attribute = SetattrFunctionContextLiteralNameAttribute(
+            name="name",
+            obj_type=instance(module_infos["User"]),
+            value_type=NoneType(),
+        )
+
+        with state.strict_optional_set(value=False):
+            assert isinstance(attribute.check_type(), LiteralNameAttributeTypeCheckResultPassed)
+        with state.strict_optional_set(value=True):
+            result = attribute.check_type()
+        assert isinstance(result, LiteralNameAttributeTypeCheckResultDoesNotSatisfyType)
+
 
 class _DummyContext:
     def __init__(self, args: list[list[Expression]], arg_types: list[list[MypyType]]) -> None: